@@ -6,6 +6,7 @@ import logging
 import os
 import asyncio
 import time
+from urllib.parse import urlencode
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.enums import ParseMode
@@ -13,7 +14,7 @@ from aiogram.types import BotCommand
 
 import bot_handlers
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
@@ -21,9 +22,18 @@ if not BOT_TOKEN:
     logger.error("❌ BOT_TOKEN not found")
     raise ValueError("BOT_TOKEN is required")
 
+# No parse_mode: messages are plain text, so user-controlled fields such as
+# channel titles are sent as-is and need no Markdown escaping
 bot = Bot(token=BOT_TOKEN)
 dp = Dispatcher(storage=MemoryStorage())
 
+ALLOWED_UPDATES = ["message", "callback_query"]
+
+# Webhook mode when WEBHOOK_URL (public base URL of this service) is set, long polling otherwise
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEBHOOK_PATH = "/telegram/webhook"
+
 async def aggressive_cleanup():
     """Aggressively clean up old bot instances"""
     logger.info("🧹 Aggressive cleanup started...")
@@ -33,10 +43,10 @@ async def aggressive_cleanup():
         for i in range(5):
             try:
                 await bot.delete_webhook(drop_pending_updates=True)
-                logger.info(f"✅ Webhook deleted attempt {i+1}")
+                logger.info("✅ Webhook deleted attempt %s", i+1)
                 await asyncio.sleep(2)
             except Exception as e:
-                logger.error(f"⚠️ Attempt {i+1}: {e}")
+                logger.error("⚠️ Attempt %s: %s", i+1, e)
         
         # Wait longer
         logger.info("⏳ Waiting 10 seconds for Telegram to release connection...")
@@ -44,7 +54,7 @@ async def aggressive_cleanup():
         
         return True
     except Exception as e:
-        logger.error(f"❌ Cleanup failed: {e}")
+        logger.error("❌ Cleanup failed: %s", e)
         return False
 
 async def setup_bot():
@@ -53,36 +63,70 @@ async def setup_bot():
         await bot.set_my_commands(commands)
         logger.info("✅ Bot commands set")
     except Exception as e:
-        logger.error(f"❌ Failed to set commands: {e}")
+        logger.error("❌ Failed to set commands: %s", e)
 
 async def start_bot():
     logger.info("🤖 Starting Telegram bot...")
     
+    # Without a secret anyone could post forged updates to the webhook route
+    if WEBHOOK_URL and not WEBHOOK_SECRET:
+        logger.error("❌ WEBHOOK_SECRET must be set when WEBHOOK_URL is set - bot not started")
+        return
+    
     try:
-        # AGGRESSIVE CLEANUP FIRST
-        await aggressive_cleanup()
+        # AGGRESSIVE CLEANUP FIRST - only needed to take over from a webhook or another poller
+        if not WEBHOOK_URL:
+            await aggressive_cleanup()
         
         # Get bot info
         bot_info = await bot.get_me()
-        logger.info(f"✅ Bot: @{bot_info.username} (ID: {bot_info.id})")
+        logger.info("✅ Bot: @%s (ID: %s)", bot_info.username, bot_info.id)
         
         await setup_bot()
         
         bot_handlers.setup_handlers(dp)
         logger.info("✅ Handlers registered")
         
+        if WEBHOOK_URL:
+            await dp.emit_startup(bot=bot)
+            await bot.set_webhook(
+                f"{WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=ALLOWED_UPDATES
+            )
+            logger.info("🎧 Bot is now receiving updates via webhook")
+            return
+        
         logger.info("🎧 Bot is now listening...")
-        await dp.start_polling(bot, allowed_updates=["message", "callback_query"])
+        await dp.start_polling(bot, allowed_updates=ALLOWED_UPDATES)
         
     except Exception as e:
-        logger.error(f"❌ Bot failed to start: {e}")
+        logger.error("❌ Bot failed to start: %s", e)
         # Try one more time after delay
         logger.info("🔄 Retrying in 30 seconds...")
         await asyncio.sleep(30)
         await start_bot()
 
+async def feed_webhook_update(update: dict) -> str:
+    """Process a webhook update and return the form-encoded reply for the response body"""
+    result = await dp.feed_webhook_update(bot, update)
+    if result is None:
+        return ""
+    
+    # A method returned by the handler rides back on the webhook response instead of a new request
+    payload = {"method": result.__api_method__}
+    for key, value in result.model_dump(warnings=False).items():
+        value = bot.session.prepare_value(value, bot=bot, files={})
+        if value is not None:
+            payload[key] = value
+    return urlencode(payload)
+
 async def stop_bot():
     logger.info("🛑 Stopping bot...")
-    await dp.stop_polling()
+    if WEBHOOK_URL:
+        await dp.emit_shutdown(bot=bot)
+    else:
+        await dp.stop_polling()
+    await bot_handlers.close_session()
     await bot.session.close()
     logger.info("✅ Bot stopped")
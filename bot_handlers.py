@@ -3,6 +3,7 @@ Telegram Bot Handlers - PHASE 4: FINAL PRODUCTION POLISH
 Complete implementation with notifications, earnings dashboard, and order management
 """
 
+import asyncio
 import logging
 from aiogram import Router, F
 from aiogram.filters import Command, StateFilter
@@ -10,8 +11,12 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, ContentType, WebAppInfo
 import aiohttp
+import orjson
 import os
-from datetime import datetime
+import random
+import re
+import time
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -20,11 +25,242 @@ router = Router()
 API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:10000")
 WEB_APP_URL = os.getenv("WEB_APP_URL", "https://telegram-ads-marketplace-app.onrender.com/webapp")
 
+# Channels fetched per backend request when browsing
+BROWSE_PAGE_SIZE = 5
+
+# Most recent orders listed in My Orders
+MY_ORDERS_PAGE_SIZE = 5
+
+# One "ad_type: price" line of the pricing message
+PRICING_LINE_RE = re.compile(r"^\s*(post|story|repost)\s*:\s*(\d+(?:\.\d+)?)\s*$", re.IGNORECASE | re.MULTILINE)
+
+# Purchase keyboards keyed by channel ID, built once per channel
+purchase_keyboards = {}
+
+# /start registrations are queued and flushed together to /users/batch
+USER_BATCH_INTERVAL = 0.05
+USER_BATCH_SIZE = 200
+user_register_queue = None
+user_batch_task = None
+
+# In-flight GET requests keyed by (endpoint, params), shared by concurrent callers
+inflight_requests = {}
+
+# Shared HTTP session to the backend, created on first use
+api_session = None
+
+# Cap on concurrent backend requests, matching the connection pool size
+API_MAX_CONNECTIONS = int(os.getenv("API_CONCURRENCY", "32"))
+api_semaphore = asyncio.Semaphore(API_MAX_CONNECTIONS)
+
+# /users/{id} lookups: telegram_id -> (fetched_at, user)
+USER_CACHE_TTL = 300
+USER_CACHE_MAX_SIZE = 10000
+user_cache = {}
+
+# Browse pages: page_start -> (fetched_at, channels, total)
+CHANNEL_CACHE_TTL = 30
+CHANNEL_CACHE_MAX_SIZE = 200
+# Pages may be refreshed early, with rising probability, only in this last stretch of the TTL
+CHANNEL_EARLY_REFRESH_SECONDS = 5
+channel_page_cache = {}
+
+# /channels/owner/{id} lookups: telegram_id -> (fetched_at, channels)
+OWNER_CHANNELS_CACHE_TTL = 15
+OWNER_CHANNELS_CACHE_MAX_SIZE = 1024
+owner_channels_cache = {}
+
+# Channel navigation clicks closer together than this are dropped: user_id -> (last click,)
+NAV_DEBOUNCE_SECONDS = 0.2
+NAV_CLICKS_MAX_SIZE = 10000
+last_nav_clicks = {}
+
+# Positive bot admin checks: (bot_id, channel_id) -> (checked_at, status)
+ADMIN_CACHE_TTL = 60
+ADMIN_CACHE_MAX_SIZE = 1024
+admin_status_cache = {}
+
+# Fire-and-forget tasks, referenced until done so they are not garbage collected
+background_tasks = set()
+
+
+# ============================================================================
+# STATIC TEXTS
+# ============================================================================
+
+WELCOME_TEMPLATE = (
+    "Hello {first_name} 🎉\n\n"
+    "◆ ◆ ◆ ◆ ◆ ◆ ◆ ◆ ◆ ◆\n\n"
+    "📢 Connect channels with advertisers\n"
+    "💰 Earn money or grow your brand\n"
+    "📊 Professional ad marketplace\n\n"
+    "👤 Your Profile:\n"
+    "🏆 {display_name}\n"
+    "🔗 @{username}\n\n"
+    "👇 Open the marketplace to get started:"
+)
+
+HELP_TEXT = (
+    "Telegram Ads Marketplace\n\n"
+    "For Channel Owners:\n"
+    "- Add channels\n"
+    "- Set pricing\n"
+    "- Approve ads\n"
+    "- Earn money\n\n"
+    "For Advertisers:\n"
+    "- Browse channels\n"
+    "- Purchase ads\n"
+    "- Submit creatives\n"
+    "- Track orders\n\n"
+    "Commands:\n"
+    "/start - Main menu\n"
+    "/help - This message\n"
+    "/stats - Statistics"
+)
+
+STATS_TEMPLATE = (
+    "Marketplace Statistics\n\n"
+    "Users: {total_users}\n"
+    "Channels: {total_channels}\n"
+    "Orders: {total_orders}\n"
+    "Active: {active_orders}"
+)
+
+ADD_CHANNEL_COMMAND_TEXT = (
+    "Add Your Channel ➕\n\n"
+    "Steps:\n"
+    "1. Add this bot as Administrator to your channel\n"
+    "2. Enable Post Messages permission\n"
+    "3. Forward any message from your channel here\n\n"
+    "Ready? Forward a channel message now 👇"
+)
+
+ADD_CHANNEL_TEXT = (
+    "Add Your Channel\n\n"
+    "Steps:\n"
+    "1. Add the bot as Administrator to your channel\n"
+    "2. Enable Post Messages permission\n"
+    "3. Forward any message from your channel here\n\n"
+    "Bot will verify admin access before registration"
+)
+
+NOT_ADMIN_TEMPLATE = (
+    "Bot Not Admin\n\n"
+    "I am not admin in {title}\n\n"
+    "Fix:\n"
+    "1. Open {title}\n"
+    "2. Settings > Administrators\n"
+    "3. Add the bot\n"
+    "4. Enable Post Messages\n"
+    "5. Try again"
+)
+
+CANNOT_POST_TEMPLATE = (
+    "No Post Permission\n\n"
+    "I am admin but cannot post in {title}\n\n"
+    "Fix:\n"
+    "1. {title} > Administrators\n"
+    "2. Tap the bot\n"
+    "3. Enable Post Messages\n"
+    "4. Try again"
+)
+
+CHANNEL_VERIFIED_TEMPLATE = (
+    "Channel Verified\n\n"
+    "Channel: {title}\n"
+    "Link: {link}\n\n"
+    "Admin confirmed\n"
+    "Can post messages\n\n"
+    "Set Pricing:\n\n"
+    "Send in this format:\n"
+    "post: 100\n"
+    "story: 50\n"
+    "repost: 25"
+)
+
+CREATIVE_SUBMITTED_TEMPLATE = (
+    "CREATIVE SUBMITTED SUCCESSFULLY\n\n"
+    "Order ID {order_id}\n"
+    "Status Waiting for approval\n\n"
+    "The channel owner will review your creative\n"
+    "You will be notified when it is approved"
+)
+
+PAYMENT_SUCCESS_TEMPLATE = (
+    "PAYMENT SUCCESSFUL\n\n"
+    "Order ID {order_id}\n"
+    "Status Paid\n\n"
+    "Your order is now being processed\n"
+    "Next step Submit your ad creative\n\n"
+    "Go to My Orders to submit creative"
+)
+
+PAYMENT_FAILED_TEMPLATE = (
+    "PAYMENT FAILED\n\n"
+    "Order ID {order_id}\n"
+    "Error {error}\n\n"
+    "Please try again or contact support"
+)
+
+# One order in the My Orders list
+ORDER_ROW_TEMPLATE = (
+    "Order {id} - {ad_type}\n"
+    "Status {status}\n"
+    "Price {price} USD\n\n"
+)
+
+# One order in the Pending Orders list
+PENDING_ORDER_ROW_TEMPLATE = (
+    "Order {id} - {ad_type}\n"
+    "Price {price} USD\n"
+    "Status Creative Submitted\n\n"
+)
+
+# Order status labels for the My Orders list
+ORDER_STATUS_LABELS = {
+    "pending_payment": "Pending Payment",
+    "paid": "Paid - Submit Creative",
+    "creative_submitted": "Creative Submitted",
+    "creative_approved": "Approved - Posting Soon",
+    "posted": "Posted",
+    "completed": "Completed",
+    "cancelled": "Cancelled",
+    "refunded": "Refunded"
+}
+
+# Order status labels for the single order view
+ORDER_DETAIL_STATUS_LABELS = {
+    "pending_payment": "Pending Payment",
+    "paid": "Paid - Awaiting Creative",
+    "creative_submitted": "Creative Submitted - Under Review",
+    "posted": "Posted to Channel",
+    "completed": "Completed",
+    "cancelled": "Cancelled"
+}
+
+# Order statuses grouped for earnings and the My Orders action buttons
+EARNED_ORDER_STATUSES = frozenset({"posted", "completed"})
+PENDING_EARNING_STATUSES = frozenset({"paid", "creative_submitted"})
+VIEWABLE_ORDER_STATUSES = frozenset({"creative_submitted", "creative_approved", "posted"})
+
+BROWSE_ERROR_TEXT = "Browse Channels\n\nCould not load channels right now\n\nPlease try again"
+
+STATS_EMPTY_TEXT = (
+    "Statistics\n\n"
+    "Users: 0\n"
+    "Channels: 0\n"
+    "Orders: 0\n"
+    "Active: 0"
+)
+
 
 # ============================================================================
 # FSM STATES
 # ============================================================================
 
+# MemoryStorage keeps a reference to each State's name string rather than a
+# copy, so every user in the same step shares one string object.
+
 class ChannelRegistration(StatesGroup):
     waiting_for_forward = State()
     waiting_for_pricing = State()
@@ -44,40 +280,218 @@ class CreativeSubmission(StatesGroup):
 # HELPER FUNCTIONS
 # ============================================================================
 
+class ApiError(Exception):
+    """Backend request failed with a non-200 response or a network error"""
+    
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+def run_in_background(coro):
+    """Schedule a coroutine without awaiting it"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(finish_background_task)
+    return task
+
+
+def finish_background_task(task: asyncio.Task):
+    """Drop a finished background task and log its failure, if any"""
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background task failed: %s", task.exception())
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared backend session, creating it on first use"""
+    global api_session
+    
+    if api_session is None or api_session.closed:
+        api_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=API_MAX_CONNECTIONS,
+                limit_per_host=API_MAX_CONNECTIONS,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            ),
+            # Fail fast on a stuck backend instead of leaving the user waiting
+            timeout=aiohttp.ClientTimeout(total=10, connect=2, sock_read=5)
+        )
+    return api_session
+
+
+async def close_session():
+    """Close the shared backend session"""
+    if api_session is not None and not api_session.closed:
+        await api_session.close()
+
+
 async def api_request(method: str, endpoint: str, **kwargs):
-    """Make API request to backend"""
+    """Make API request to backend, sharing identical in-flight GETs"""
+    if method != "GET":
+        return await send_api_request(method, endpoint, **kwargs)
+    
+    key = (endpoint, tuple(sorted(kwargs.get("params", {}).items())))
+    task = inflight_requests.get(key)
+    if task is None:
+        task = asyncio.create_task(send_api_request(method, endpoint, **kwargs))
+        inflight_requests[key] = task
+        task.add_done_callback(lambda _: inflight_requests.pop(key, None))
+    
+    # Shield so one cancelled caller does not cancel the shared request
+    return await asyncio.shield(task)
+
+
+async def send_api_request(method: str, endpoint: str, **kwargs):
+    """Send a single API request to backend"""
     url = f"{API_BASE_URL}{endpoint}"
-    logger.info(f"API {method} {url}")
+    logger.debug("API %s %s", method, url)
+    
+    # Encode JSON bodies with orjson instead of aiohttp's stdlib json
+    if "json" in kwargs:
+        kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+        kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
     
     try:
-        async with aiohttp.ClientSession() as session:
+        session = await get_session()
+        # Wait here rather than in the pool, where waiting counts against the timeout
+        async with api_semaphore:
             async with session.request(method, url, **kwargs) as response:
-                logger.info(f"Response: {response.status}")
+                logger.debug("Response: %s", response.status)
                 if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"API Error {response.status}: {error_text}")
-                    return {"error": error_text}
+                    return orjson.loads(await response.read())
+                error_text = await response.text()
+                logger.error("API Error %s: %s", response.status, error_text)
+                raise ApiError(error_text, status=response.status)
+    except ApiError:
+        raise
+    except asyncio.TimeoutError as e:
+        logger.error("Request timed out: %s %s", method, url)
+        raise ApiError("Backend timed out") from e
     except Exception as e:
-        logger.error(f"Request failed: {e}")
-        return {"error": str(e)}
+        logger.error("Request failed: %s", e)
+        raise ApiError(str(e)) from e
+
+
+def store_cached(cache: dict, key, entry: tuple, ttl: float, max_size: int):
+    """Store an entry whose first item is its timestamp, dropping expired and overflow entries"""
+    # Re-insert so dict order stays oldest first, then trim from the front
+    cache.pop(key, None)
+    cache[key] = entry
+    now = time.monotonic()
+    while len(cache) > 1:
+        oldest_key = next(iter(cache))
+        if len(cache) <= max_size and now - cache[oldest_key][0] < ttl:
+            break
+        del cache[oldest_key]
+
+
+async def get_user_cached(telegram_id: int) -> dict:
+    """Get user by Telegram ID, served from cache for USER_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = user_cache.get(telegram_id)
+    if cached and now - cached[0] < USER_CACHE_TTL:
+        return cached[1]
+    
+    user = await api_request("GET", f"/users/{telegram_id}")
+    cache_user(telegram_id, user)
+    return user
+
+
+def cache_user(telegram_id: int, user: dict):
+    """Store a fresh user record so the next lookup skips the backend"""
+    store_cached(user_cache, telegram_id, (time.monotonic(), user), USER_CACHE_TTL, USER_CACHE_MAX_SIZE)
+
+
+async def get_owner_channels_cached(telegram_id: int) -> list:
+    """Get a user's channels, served from cache for OWNER_CHANNELS_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = owner_channels_cache.get(telegram_id)
+    if cached and now - cached[0] < OWNER_CHANNELS_CACHE_TTL:
+        return cached[1]
+    
+    channels = await api_request("GET", f"/channels/owner/{telegram_id}")
+    store_cached(
+        owner_channels_cache, telegram_id, (now, channels),
+        OWNER_CHANNELS_CACHE_TTL, OWNER_CHANNELS_CACHE_MAX_SIZE
+    )
+    return channels
+
+
+async def register_user(params: dict):
+    """Queue a user registration and wait for its batched result"""
+    global user_register_queue, user_batch_task
+    
+    if user_register_queue is None:
+        user_register_queue = asyncio.Queue()
+    if user_batch_task is None or user_batch_task.done():
+        user_batch_task = asyncio.create_task(user_batch_flusher())
+    
+    future = asyncio.get_running_loop().create_future()
+    user_register_queue.put_nowait((params, future))
+    return await future
+
+
+async def user_batch_flusher():
+    """Drain queued registrations every USER_BATCH_INTERVAL and POST them in one request"""
+    while True:
+        batch = [await user_register_queue.get()]
+        await asyncio.sleep(USER_BATCH_INTERVAL)
+        while len(batch) < USER_BATCH_SIZE and not user_register_queue.empty():
+            batch.append(user_register_queue.get_nowait())
+        
+        try:
+            await flush_user_batch(batch)
+        except Exception as e:
+            # Keep the flusher alive and release every caller still waiting on this batch
+            logger.error("User batch flush failed: %s", e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ApiError(f"Batch registration failed: {e}"))
+
+
+async def flush_user_batch(batch: list):
+    """Register one batch of users and resolve each caller's future with its own result"""
+    try:
+        result = await api_request("POST", "/users/batch", json=[params for params, _ in batch])
+    except ApiError as e:
+        if e.status is None:
+            # Backend unreachable or timed out, so per-user requests would fail the same way
+            raise
+        # One bad row fails the whole batch, so register each user on their own instead
+        logger.warning("Batch registration rejected, retrying %s users one by one: %s", len(batch), e)
+        result = await asyncio.gather(
+            *(api_request("POST", "/users/", params=params) for params, _ in batch),
+            return_exceptions=True
+        )
+    
+    for i, (params, future) in enumerate(batch):
+        if future.done():
+            continue
+        user = result[i] if i < len(result) else ApiError("Batch registration failed")
+        if isinstance(user, BaseException):
+            future.set_exception(user)
+        else:
+            cache_user(params["telegram_id"], user)
+            future.set_result(user)
 
 
 async def send_notification(bot, telegram_id: int, message: str):
     """Send notification to user"""
     try:
         await bot.send_message(chat_id=telegram_id, text=message)
-        logger.info(f"Notification sent to {telegram_id}")
+        logger.info("Notification sent to %s", telegram_id)
     except Exception as e:
-        logger.error(f"Failed to send notification to {telegram_id}: {e}")
+        logger.error("Failed to send notification to %s: %s", telegram_id, e)
 
 
 async def notify_order_status_change(bot, order_id: int, old_status: str, new_status: str):
     """Notify relevant parties when order status changes"""
     # Get order details
-    order = await api_request("GET", f"/orders/{order_id}")
-    if "error" in order:
+    try:
+        order = await api_request("GET", f"/orders/{order_id}")
+    except ApiError:
         return
     
     buyer_telegram_id = order.get('buyer_telegram_id')
@@ -89,30 +503,44 @@ async def notify_order_status_change(bot, order_id: int, old_status: str, new_st
     
     elif new_status == "creative_submitted":
         message = f"Order {order_id} creative submitted - Waiting for channel owner approval"
-        await send_notification(bot, buyer_telegram_id, message)
-        
-        # Notify channel owner
-        channel = await api_request("GET", f"/channels/{order['channel_id']}")
-        if "error" not in channel:
-            owner = await api_request("GET", f"/users/telegram/{channel['owner_telegram_id']}")
-            if "error" not in owner:
-                owner_message = f"New order {order_id} waiting for review - Check Pending Orders"
-                await send_notification(bot, channel['owner_telegram_id'], owner_message)
+        # The owner lookups do not depend on the buyer message, so both go out together
+        await asyncio.gather(
+            send_notification(bot, buyer_telegram_id, message),
+            notify_channel_owner(bot, order_id, order['channel_id'])
+        )
     
     elif new_status == "posted":
         message = f"Order {order_id} approved and posted to channel - Check My Orders for details"
         await send_notification(bot, buyer_telegram_id, message)
 
 
+async def notify_channel_owner(bot, order_id: int, channel_id: int):
+    """Tell the channel owner an order is waiting for review"""
+    try:
+        channel = await api_request("GET", f"/channels/{channel_id}")
+        await api_request("GET", f"/users/telegram/{channel['owner_telegram_id']}")
+    except ApiError:
+        return
+    
+    owner_message = f"New order {order_id} waiting for review - Check Pending Orders"
+    await send_notification(bot, channel['owner_telegram_id'], owner_message)
+
+
 async def check_bot_admin_status(message: Message, channel_id: int) -> dict:
     """Check if bot is admin in the channel"""
+    bot = message.bot
+    key = (bot.id, channel_id)
+    now = time.monotonic()
+    cached = admin_status_cache.get(key)
+    if cached and now - cached[0] < ADMIN_CACHE_TTL:
+        return cached[1]
+    
     try:
-        bot = message.bot
         bot_member = await bot.get_chat_member(chat_id=channel_id, user_id=bot.id)
         
-        logger.info(f"Bot status in channel {channel_id}: {bot_member.status}")
+        logger.info("Bot status in channel %s: %s", channel_id, bot_member.status)
         
-        is_admin = bot_member.status in ["administrator", "creator"]
+        is_admin = bot_member.status in ("administrator", "creator")
         can_post = False
         
         if bot_member.status == "creator":
@@ -120,12 +548,55 @@ async def check_bot_admin_status(message: Message, channel_id: int) -> dict:
         elif bot_member.status == "administrator":
             can_post = getattr(bot_member, 'can_post_messages', False)
         
-        return {"is_admin": is_admin, "can_post": can_post}
+        status = {"is_admin": is_admin, "can_post": can_post}
+        
+        # Only cache success - after a failed check the owner fixes permissions and retries
+        if is_admin and can_post:
+            store_cached(admin_status_cache, key, (now, status), ADMIN_CACHE_TTL, ADMIN_CACHE_MAX_SIZE)
+        
+        return status
     except Exception as e:
-        logger.error(f"Admin check error: {e}")
+        logger.error("Admin check error: %s", e)
         return {"is_admin": False, "can_post": False}
 
 
+def invalidate_admin_status(bot_id: int, channel_id: int):
+    """Forget the cached admin status for a channel"""
+    admin_status_cache.pop((bot_id, channel_id), None)
+
+
+async def set_flow_state(state: FSMContext, new_state, data: dict):
+    """Store FSM data and move to the next state in one step"""
+    # Two dict writes with MemoryStorage; swap for a single write on a remote storage
+    await state.set_data(data)
+    await state.set_state(new_state)
+
+
+# Shared by every keyboard that ends with a way back to the main menu
+MAIN_MENU_BUTTON = InlineKeyboardButton(text="Main Menu", callback_data="main_menu")
+
+# Static buttons reused across several keyboards
+MY_ORDERS_BUTTON = InlineKeyboardButton(text="My Orders", callback_data="my_orders")
+BROWSE_CHANNELS_BUTTON = InlineKeyboardButton(text="Browse Channels", callback_data="browse_channels")
+CANCEL_BROWSE_BUTTON = InlineKeyboardButton(text="Cancel", callback_data="browse_channels")
+
+
+def build_purchase_keyboard(channel_id: int, pricing: dict) -> InlineKeyboardMarkup:
+    """Build ad type selection keyboard for a channel and cache it"""
+    keyboard = [
+        [InlineKeyboardButton(
+            text=f"{ad_type.capitalize()} - {price} USD",
+            callback_data=f"select_adtype_{ad_type}"
+        )]
+        for ad_type, price in pricing.items()
+    ]
+    keyboard.append([CANCEL_BROWSE_BUTTON])
+    
+    markup = InlineKeyboardMarkup(inline_keyboard=keyboard)
+    purchase_keyboards[channel_id] = markup
+    return markup
+
+
 def create_main_menu_keyboard(is_owner=False, is_advertiser=False):
     """Create main menu keyboard based on user roles"""
     keyboard = []
@@ -166,7 +637,7 @@ def create_channel_owner_menu():
         [InlineKeyboardButton(text="My Earnings", callback_data="my_earnings")],
         [InlineKeyboardButton(text="Pending Orders", callback_data="pending_orders")],
         [InlineKeyboardButton(text="I also want to Advertise", callback_data="role_advertiser")],
-        [InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]
+        [MAIN_MENU_BUTTON]
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
@@ -177,11 +648,53 @@ def create_advertiser_menu():
         [InlineKeyboardButton(text="Browse Channels", callback_data="browse_channels")],
         [InlineKeyboardButton(text="My Orders", callback_data="my_orders")],
         [InlineKeyboardButton(text="I also have a Channel", callback_data="role_channel_owner")],
-        [InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]
+        [MAIN_MENU_BUTTON]
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+# Static keyboards, built once at import
+CHANNEL_OWNER_MENU = create_channel_owner_menu()
+ADVERTISER_MENU = create_advertiser_menu()
+
+WEB_APP_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(
+        text="🌐 Open Marketplace",
+        web_app=WebAppInfo(url=WEB_APP_URL)
+    )]
+])
+
+MAIN_MENU_ONLY_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [MAIN_MENU_BUTTON]
+])
+
+MY_ORDERS_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [MY_ORDERS_BUTTON]
+])
+
+MY_ORDERS_MAIN_MENU_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [MY_ORDERS_BUTTON],
+    [MAIN_MENU_BUTTON]
+])
+
+NO_ORDERS_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [BROWSE_CHANNELS_BUTTON],
+    [MAIN_MENU_BUTTON]
+])
+
+CONFIRM_PURCHASE_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="Confirm Order", callback_data="confirm_purchase")],
+    [CANCEL_BROWSE_BUTTON]
+])
+
+# Main menu for every (is_owner, is_advertiser) combination
+MAIN_MENU_KEYBOARDS = {
+    (is_owner, is_advertiser): create_main_menu_keyboard(is_owner, is_advertiser)
+    for is_owner in (False, True)
+    for is_advertiser in (False, True)
+}
+
+
 # ============================================================================
 # COMMAND HANDLERS
 # ============================================================================
@@ -189,122 +702,66 @@ def create_advertiser_menu():
 @router.message(Command("start"))
 async def cmd_start(message: Message, state: FSMContext):
     """Handle /start command"""
-    logger.info(f"/start from user {message.from_user.id}")
+    logger.info("/start from user %s", message.from_user.id)
     await state.clear()
     
-    # Register/get user in database
-    result = await api_request(
-        "POST", "/users/",
-        params={
-            "telegram_id": message.from_user.id,
-            "username": message.from_user.username or "",
-            "first_name": message.from_user.first_name or ""
-        }
+    welcome_text = WELCOME_TEMPLATE.format(
+        first_name=message.from_user.first_name,
+        display_name=message.from_user.first_name or 'User',
+        username=message.from_user.username or 'Not set'
     )
     
-    if "error" in result:
-        logger.error(f"User registration failed: {result['error']}")
-        is_owner = False
-        is_advertiser = False
-    else:
-        is_owner = result.get("is_channel_owner", False)
-        is_advertiser = result.get("is_advertiser", False)
-    
-    welcome_text = (
-        f"Hello {message.from_user.first_name} 🎉\n\n"
-        f"◆ ◆ ◆ ◆ ◆ ◆ ◆ ◆ ◆ ◆\n\n"
-        f"📢 Connect channels with advertisers\n"
-        f"💰 Earn money or grow your brand\n"
-        f"📊 Professional ad marketplace\n\n"
-        f"👤 Your Profile:\n"
-        f"🏆 {message.from_user.first_name or 'User'}\n"
-        f"🔗 @{message.from_user.username or 'Not set'}\n\n"
-        f"👇 Open the marketplace to get started:"
-    )
-    
-    # ONLY Web App button - everything else in the marketplace!
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(
-            text="🌐 Open Marketplace",
-            web_app=WebAppInfo(url=WEB_APP_URL)
-        )]
-    ])
-    await message.answer(welcome_text, reply_markup=keyboard)
+    # Register/get user in database while the welcome is being sent
+    try:
+        await asyncio.gather(
+            register_user({
+                "telegram_id": message.from_user.id,
+                "username": message.from_user.username or "",
+                "first_name": message.from_user.first_name or ""
+            }),
+            # ONLY Web App button - everything else in the marketplace!
+            message.answer(welcome_text, reply_markup=WEB_APP_KEYBOARD)
+        )
+    except ApiError as e:
+        logger.error("User registration failed: %s", e)
 
 
 @router.message(Command("addchannel"))
 async def cmd_add_channel(message: Message, state: FSMContext):
     """Start channel registration via command"""
-    logger.info(f"/addchannel from user {message.from_user.id}")
+    logger.info("/addchannel from user %s", message.from_user.id)
     
     try:
         await state.clear()
         
-        text = (
-            "Add Your Channel ➕\n\n"
-            "Steps:\n"
-            "1. Add this bot as Administrator to your channel\n"
-            "2. Enable Post Messages permission\n"
-            "3. Forward any message from your channel here\n\n"
-            "Ready? Forward a channel message now 👇"
-        )
-        
-        await message.answer(text)
+        await message.answer(ADD_CHANNEL_COMMAND_TEXT)
         await state.set_state(ChannelRegistration.waiting_for_forward)
-        logger.info(f"Channel registration started for {message.from_user.id}")
+        logger.info("Channel registration started for %s", message.from_user.id)
         
     except Exception as e:
-        logger.error(f"Error in /addchannel: {e}")
+        logger.error("Error in /addchannel: %s", e)
         await message.answer("Error - Please try /start")
 
 
 @router.message(Command("help"))
 async def cmd_help(message: Message):
     """Handle /help command"""
-    help_text = (
-        "Telegram Ads Marketplace\n\n"
-        "For Channel Owners:\n"
-        "- Add channels\n"
-        "- Set pricing\n"
-        "- Approve ads\n"
-        "- Earn money\n\n"
-        "For Advertisers:\n"
-        "- Browse channels\n"
-        "- Purchase ads\n"
-        "- Submit creatives\n"
-        "- Track orders\n\n"
-        "Commands:\n"
-        "/start - Main menu\n"
-        "/help - This message\n"
-        "/stats - Statistics"
-    )
-    await message.answer(help_text)
+    # Returned instead of awaited so webhook mode can send it in the update response
+    return message.answer(HELP_TEXT)
 
 
 @router.message(Command("stats"))
 async def cmd_stats(message: Message):
     """Handle /stats command"""
-    stats = await api_request("GET", "/stats")
-    
-    if "error" in stats:
-        logger.error(f"Stats fetch failed: {stats['error']}")
-        stats_text = (
-            "Statistics\n\n"
-            "Users: 0\n"
-            "Channels: 0\n"
-            "Orders: 0\n"
-            "Active: 0"
-        )
+    try:
+        stats = await api_request("GET", "/stats")
+    except ApiError as e:
+        logger.error("Stats fetch failed: %s", e)
+        stats_text = STATS_EMPTY_TEXT
     else:
-        stats_text = (
-            "Marketplace Statistics\n\n"
-            f"Users: {stats.get('total_users', 0)}\n"
-            f"Channels: {stats.get('total_channels', 0)}\n"
-            f"Orders: {stats.get('total_orders', 0)}\n"
-            f"Active: {stats.get('active_orders', 0)}"
-        )
+        stats_text = STATS_TEMPLATE.format_map(stats)
     
-    await message.answer(stats_text)
+    return message.answer(stats_text)
 
 
 # ============================================================================
@@ -314,41 +771,51 @@ async def cmd_stats(message: Message):
 @router.callback_query(F.data == "role_channel_owner")
 async def callback_role_channel_owner(callback: CallbackQuery):
     """Handle channel owner role selection"""
-    logger.info(f"role_channel_owner from {callback.from_user.id}")
+    logger.info("role_channel_owner from %s", callback.from_user.id)
     
-    # Update user role in database
-    result = await api_request(
-        "PATCH", f"/users/{callback.from_user.id}",
-        json={"is_channel_owner": True}
-    )
+    text = "Channel Owner Menu\n\nList your channels and earn money"
     
-    if "error" in result:
+    # Update user role in database before showing the new menu
+    try:
+        user = await api_request("PATCH", f"/users/{callback.from_user.id}", json={"is_channel_owner": True})
+    except ApiError:
         await callback.answer("Failed to update role - Try again", show_alert=True)
-    else:
-        await callback.answer("Role updated - You are now a Channel Owner", show_alert=False)
+        return
     
-    text = "Channel Owner Menu\n\nList your channels and earn money"
-    await callback.message.edit_text(text, reply_markup=create_channel_owner_menu())
+    # The PATCH response carries the updated role flags
+    cache_user(callback.from_user.id, user)
+    run_in_background(callback.answer("Role updated - You are now a Channel Owner", show_alert=False))
+    
+    try:
+        await callback.message.edit_text(text, reply_markup=CHANNEL_OWNER_MENU)
+    except Exception as e:
+        # A repeat tap leaves the menu unchanged, which Telegram reports as an error
+        logger.warning("Failed to edit message: %s", e)
 
 
 @router.callback_query(F.data == "role_advertiser")
 async def callback_role_advertiser(callback: CallbackQuery):
     """Handle advertiser role selection"""
-    logger.info(f"role_advertiser from {callback.from_user.id}")
+    logger.info("role_advertiser from %s", callback.from_user.id)
     
-    # Update user role in database
-    result = await api_request(
-        "PATCH", f"/users/{callback.from_user.id}",
-        json={"is_advertiser": True}
-    )
+    text = "Advertiser Menu\n\nFind channels for your ads"
     
-    if "error" in result:
+    # Update user role in database before showing the new menu
+    try:
+        user = await api_request("PATCH", f"/users/{callback.from_user.id}", json={"is_advertiser": True})
+    except ApiError:
         await callback.answer("Failed to update role - Try again", show_alert=True)
-    else:
-        await callback.answer("Role updated - You are now an Advertiser", show_alert=False)
+        return
     
-    text = "Advertiser Menu\n\nFind channels for your ads"
-    await callback.message.edit_text(text, reply_markup=create_advertiser_menu())
+    # The PATCH response carries the updated role flags
+    cache_user(callback.from_user.id, user)
+    run_in_background(callback.answer("Role updated - You are now an Advertiser", show_alert=False))
+    
+    try:
+        await callback.message.edit_text(text, reply_markup=ADVERTISER_MENU)
+    except Exception as e:
+        # A repeat tap leaves the menu unchanged, which Telegram reports as an error
+        logger.warning("Failed to edit message: %s", e)
 
 
 # ============================================================================
@@ -358,35 +825,24 @@ async def callback_role_advertiser(callback: CallbackQuery):
 @router.callback_query(F.data == "add_channel")
 async def callback_add_channel(callback: CallbackQuery, state: FSMContext):
     """Start channel registration"""
-    logger.info(f"add_channel from {callback.from_user.id}")
+    logger.info("add_channel from %s", callback.from_user.id)
     
     try:
         await state.clear()
         
-        text = (
-            "Add Your Channel\n\n"
-            "Steps:\n"
-            "1. Add the bot as Administrator to your channel\n"
-            "2. Enable Post Messages permission\n"
-            "3. Forward any message from your channel here\n\n"
-            "Bot will verify admin access before registration"
-        )
-        
-        await callback.message.edit_text(text)
+        await callback.message.edit_text(ADD_CHANNEL_TEXT)
         await state.set_state(ChannelRegistration.waiting_for_forward)
         await callback.answer("Ready - Forward a message from your channel")
         
-        logger.info("add_channel completed successfully")
-        
     except Exception as e:
-        logger.error(f"Error in add_channel: {e}", exc_info=True)
-        await callback.answer("Error - Try /start", show_alert=True)
+        logger.error("Error in add_channel: %s", e, exc_info=True)
+        run_in_background(callback.answer("Error - Try /start", show_alert=True))
 
 
 @router.message(StateFilter(ChannelRegistration.waiting_for_forward))
 async def process_channel_forward(message: Message, state: FSMContext):
     """Process forwarded channel message"""
-    logger.info(f"Channel forward from {message.from_user.id}")
+    logger.info("Channel forward from %s", message.from_user.id)
     
     try:
         if not message.forward_from_chat or message.forward_from_chat.type != "channel":
@@ -397,69 +853,39 @@ async def process_channel_forward(message: Message, state: FSMContext):
         channel_title = message.forward_from_chat.title or "Unknown Channel"
         channel_username = message.forward_from_chat.username
         
-        logger.info(f"Channel: {channel_title} ({channel_id})")
+        logger.info("Channel: %s (%s)", channel_title, channel_id)
         
         # Check admin status
         admin_check = await check_bot_admin_status(message, channel_id)
         
         if not admin_check["is_admin"]:
-            text = (
-                f"Bot Not Admin\n\n"
-                f"I am not admin in {channel_title}\n\n"
-                f"Fix:\n"
-                f"1. Open {channel_title}\n"
-                f"2. Settings > Administrators\n"
-                f"3. Add the bot\n"
-                f"4. Enable Post Messages\n"
-                f"5. Try again"
-            )
-            await message.answer(text)
+            await message.answer(NOT_ADMIN_TEMPLATE.format(title=channel_title))
             await state.clear()
-            logger.info(f"Rejected: Not admin in {channel_id}")
+            logger.info("Rejected: Not admin in %s", channel_id)
             return
         
         if not admin_check["can_post"]:
-            text = (
-                f"No Post Permission\n\n"
-                f"I am admin but cannot post in {channel_title}\n\n"
-                f"Fix:\n"
-                f"1. {channel_title} > Administrators\n"
-                f"2. Tap the bot\n"
-                f"3. Enable Post Messages\n"
-                f"4. Try again"
-            )
-            await message.answer(text)
+            await message.answer(CANNOT_POST_TEMPLATE.format(title=channel_title))
             await state.clear()
-            logger.info(f"Rejected: Cannot post in {channel_id}")
+            logger.info("Rejected: Cannot post in %s", channel_id)
             return
         
         # SUCCESS - Save to state for pricing
-        await state.update_data(
-            channel_id=channel_id,
-            channel_title=channel_title,
-            channel_username=channel_username
-        )
-        
-        text = (
-            f"Channel Verified\n\n"
-            f"Channel: {channel_title}\n"
-            f"Link: {channel_username or 'Private'}\n\n"
-            f"Admin confirmed\n"
-            f"Can post messages\n\n"
-            f"Set Pricing:\n\n"
-            f"Send in this format:\n"
-            f"post: 100\n"
-            f"story: 50\n"
-            f"repost: 25"
-        )
+        await set_flow_state(state, ChannelRegistration.waiting_for_pricing, {
+            "channel_id": channel_id,
+            "channel_title": channel_title,
+            "channel_username": channel_username
+        })
         
-        await message.answer(text)
-        await state.set_state(ChannelRegistration.waiting_for_pricing)
+        await message.answer(CHANNEL_VERIFIED_TEMPLATE.format(
+            title=channel_title,
+            link=channel_username or 'Private'
+        ))
         
-        logger.info(f"Admin verified for {channel_id}")
+        logger.info("Admin verified for %s", channel_id)
         
     except Exception as e:
-        logger.error(f"Error: {e}", exc_info=True)
+        logger.error("Error: %s", e, exc_info=True)
         await message.answer("Error - Try again")
         await state.clear()
 
@@ -475,18 +901,10 @@ async def process_channel_pricing(message: Message, state: FSMContext):
             return
         
         # Parse pricing
-        pricing = {}
-        for line in message.text.strip().lower().split('\n'):
-            if ':' in line:
-                parts = line.split(':')
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    try:
-                        value = float(parts[1].strip())
-                        if key in ['post', 'story', 'repost']:
-                            pricing[key] = value
-                    except:
-                        pass
+        pricing = {
+            match.group(1).lower(): float(match.group(2))
+            for match in PRICING_LINE_RE.finditer(message.text or "")
+        }
         
         if not pricing:
             text = (
@@ -500,23 +918,28 @@ async def process_channel_pricing(message: Message, state: FSMContext):
             return
         
         # SAVE TO DATABASE via API
-        result = await api_request(
-            "POST", "/channels/",
-            json={
-                "owner_telegram_id": message.from_user.id,
-                "telegram_channel_id": data["channel_id"],
-                "channel_title": data["channel_title"],
-                "channel_username": data["channel_username"],
-                "pricing": pricing
-            }
-        )
-        
-        if "error" in result:
-            if "already exists" in str(result.get("error", "")).lower():
+        try:
+            result = await api_request(
+                "POST", "/channels/",
+                json={
+                    "owner_telegram_id": message.from_user.id,
+                    "telegram_channel_id": data["channel_id"],
+                    "channel_title": data["channel_title"],
+                    "channel_username": data["channel_username"],
+                    "pricing": pricing
+                }
+            )
+        except ApiError as e:
+            if "already exists" in str(e).lower():
                 await message.answer(f"{data['channel_title']} already listed in database")
             else:
-                await message.answer(f"Database error: {result.get('error')}\n\nPlease try again")
+                await message.answer(f"Database error: {e}\n\nPlease try again")
         else:
+            # Backend marks the owner as a channel owner; new channel shifts browse pages
+            user_cache.pop(message.from_user.id, None)
+            owner_channels_cache.pop(message.from_user.id, None)
+            channel_page_cache.clear()
+            build_purchase_keyboard(result.get('id'), pricing)
             pricing_str = "\n".join([f"- {k}: {v} USD" for k, v in pricing.items()])
             
             text = (
@@ -532,10 +955,10 @@ async def process_channel_pricing(message: Message, state: FSMContext):
         
         await state.clear()
         
-        logger.info(f"Registered in DB: {data['channel_title']} with pricing {pricing}")
+        logger.info("Registered in DB: %s with pricing %s", data['channel_title'], pricing)
         
     except Exception as e:
-        logger.error(f"Error: {e}", exc_info=True)
+        logger.error("Error: %s", e, exc_info=True)
         await message.answer("Error saving to database - Try again")
         await state.clear()
 
@@ -543,38 +966,49 @@ async def process_channel_pricing(message: Message, state: FSMContext):
 @router.callback_query(F.data == "my_channels")
 async def callback_my_channels(callback: CallbackQuery):
     """Show user's channels"""
-    logger.info(f"my_channels from {callback.from_user.id}")
+    logger.info("my_channels from %s", callback.from_user.id)
+    
+    run_in_background(callback.answer())
     
     # Fetch user's channels from database
-    channels = await api_request("GET", f"/channels/owner/{callback.from_user.id}")
+    try:
+        channels = await get_owner_channels_cached(callback.from_user.id)
+    except ApiError:
+        channels = []
     
-    if "error" in channels or not channels:
+    if not channels:
         text = "My Channels\n\nYou have not added any channels yet\n\nUse Add My Channel to get started"
     else:
-        text = f"My Channels ({len(channels)} total)\n\n"
+        parts = [f"My Channels ({len(channels)} total)\n\n"]
         for channel in channels[:10]:
             pricing = channel.get("pricing", {})
             pricing_text = ", ".join([f"{k}: {v} USD" for k, v in pricing.items()])
-            text += f"Channel: {channel['channel_title']}\n"
-            text += f"   Pricing: {pricing_text}\n"
-            text += f"   Status: {channel['status']}\n\n"
+            parts.append(
+                f"Channel: {channel['channel_title']}\n"
+                f"   Pricing: {pricing_text}\n"
+                f"   Status: {channel['status']}\n\n"
+            )
+        text = "".join(parts)
     
-    await callback.message.edit_text(text)
-    await callback.answer()
+    return callback.message.edit_text(text)
 
 
 @router.callback_query(F.data == "my_earnings")
 async def callback_my_earnings(callback: CallbackQuery):
     """Show channel owner earnings dashboard"""
-    logger.info(f"my_earnings from {callback.from_user.id}")
+    logger.info("my_earnings from %s", callback.from_user.id)
+    
+    run_in_background(callback.answer())
     
     # Fetch user's channels
-    channels = await api_request("GET", f"/channels/owner/{callback.from_user.id}")
+    try:
+        channels = await get_owner_channels_cached(callback.from_user.id)
+    except ApiError:
+        channels = []
     
-    if "error" in channels or not channels:
+    if not channels:
         text = "Earnings Dashboard\n\nYou have no channels yet\n\nAdd a channel to start earning"
         await callback.message.edit_text(text)
-        await callback.answer()
         return
     
     # Calculate total earnings
@@ -585,22 +1019,29 @@ async def callback_my_earnings(callback: CallbackQuery):
     
     channel_earnings = []
     
-    for channel in channels:
-        # Get orders for this channel
-        orders = await api_request("GET", f"/orders/channel/{channel['id']}")
+    # Get orders for every channel concurrently
+    results = await asyncio.gather(
+        *(api_request("GET", f"/orders/channel/{channel['id']}") for channel in channels),
+        return_exceptions=True
+    )
+    
+    for channel, orders in zip(channels, results):
+        # Skip channels whose orders could not be fetched
+        if isinstance(orders, BaseException):
+            continue
         
-        if "error" not in orders and orders:
+        if orders:
             channel_total = 0.0
             channel_completed = 0
             channel_pending = 0
             
             for order in orders:
                 total_orders += 1
-                if order['status'] in ['posted', 'completed']:
+                if order['status'] in EARNED_ORDER_STATUSES:
                     channel_total += order['price']
                     channel_completed += 1
                     completed_orders += 1
-                elif order['status'] in ['paid', 'creative_submitted']:
+                elif order['status'] in PENDING_EARNING_STATUSES:
                     channel_pending += 1
                     pending_orders += 1
             
@@ -615,22 +1056,25 @@ async def callback_my_earnings(callback: CallbackQuery):
                 })
     
     # Build earnings report
-    text = "Earnings Dashboard\n\n"
-    text += f"Total Earnings {total_earnings} USD\n"
-    text += f"Total Orders {total_orders}\n"
-    text += f"Completed {completed_orders}\n"
-    text += f"Pending {pending_orders}\n\n"
+    parts = [
+        "Earnings Dashboard\n\n"
+        f"Total Earnings {total_earnings} USD\n"
+        f"Total Orders {total_orders}\n"
+        f"Completed {completed_orders}\n"
+        f"Pending {pending_orders}\n\n"
+    ]
     
     if channel_earnings:
-        text += "Per Channel\n\n"
+        parts.append("Per Channel\n\n")
         for ch in channel_earnings:
-            text += f"{ch['name']}\n"
-            text += f"  Earned {ch['earned']} USD\n"
-            text += f"  Completed {ch['completed']} orders\n"
-            text += f"  Pending {ch['pending']} orders\n\n"
+            parts.append(
+                f"{ch['name']}\n"
+                f"  Earned {ch['earned']} USD\n"
+                f"  Completed {ch['completed']} orders\n"
+                f"  Pending {ch['pending']} orders\n\n"
+            )
     
-    await callback.message.edit_text(text)
-    await callback.answer()
+    return callback.message.edit_text("".join(parts))
 
 
 # ============================================================================
@@ -640,37 +1084,89 @@ async def callback_my_earnings(callback: CallbackQuery):
 @router.callback_query(F.data == "browse_channels")
 async def callback_browse_channels(callback: CallbackQuery, state: FSMContext):
     """Browse channels"""
-    logger.info(f"browse_channels from {callback.from_user.id}")
+    logger.info("browse_channels from %s", callback.from_user.id)
     
-    await state.clear()
+    run_in_background(callback.answer())
     
-    # Fetch channels from database
-    channels = await api_request("GET", "/channels/")
+    # Fetch only the first page of channels from database
+    try:
+        channels, total = await fetch_channel_page(0)
+    except ApiError:
+        return callback.message.edit_text(BROWSE_ERROR_TEXT, reply_markup=MAIN_MENU_ONLY_KEYBOARD)
+    
+    # Leave any flow and keep the shown channels for the purchase step
+    await set_flow_state(state, None, {"browsed_channels": index_browsed_channels(channels)})
     
-    if "error" in channels or not isinstance(channels, list) or len(channels) == 0:
+    if not channels:
         text = "Browse Channels\n\nNo channels available yet\n\nCheck back soon"
-        await callback.message.edit_text(text)
-        await callback.answer()
-        return
+        return callback.message.edit_text(text)
     
     # Show first channel with purchase option
-    await show_channel_detail(callback.message, channels[0], 0, len(channels), callback.from_user.id)
-    await callback.answer()
+    return show_channel_detail(callback.message, channels[0], 0, total, len(channels) > 1, callback.from_user.id)
 
 
-async def show_channel_detail(message, channel: dict, index: int, total: int, user_id: int):
-    """Show detailed channel view with purchase button"""
+async def fetch_channel_page(index: int):
+    """Fetch the page of channels containing index, plus one lookahead channel, and the channel total"""
+    page_start = index - index % BROWSE_PAGE_SIZE
+    now = time.monotonic()
+    cached = channel_page_cache.get(page_start)
+    
+    if cached and now - cached[0] < CHANNEL_CACHE_TTL:
+        channels, total = cached[1], cached[2]
+        # Near expiry, refresh early with a probability that grows with age,
+        # so pages do not all expire at once and stampede the backend
+        if now - cached[0] > CHANNEL_CACHE_TTL - CHANNEL_EARLY_REFRESH_SECONDS * random.random():
+            run_in_background(refresh_channel_page(page_start))
+    else:
+        channels, total = await refresh_channel_page(page_start)
+    
+    # Drop channels before index so channels[0] is the requested one
+    return channels[index - page_start:], total
+
+
+async def refresh_channel_page(page_start: int) -> tuple:
+    """Fetch one browse page and the channel total from the backend and store them in the cache"""
+    channels, count = await asyncio.gather(
+        api_request(
+            "GET", "/channels/",
+            params={"limit": BROWSE_PAGE_SIZE + 1, "offset": page_start}
+        ),
+        api_request("GET", "/channels/count"),
+        return_exceptions=True
+    )
+    
+    if isinstance(channels, BaseException):
+        # Serve the expired page rather than report an empty catalogue
+        stale = channel_page_cache.get(page_start)
+        if stale:
+            logger.warning("Serving stale browse page %s: %s", page_start, channels)
+            return stale[1], stale[2]
+        raise channels
+    
+    # A failed count only drops the "of N" from the card label
+    total = None if isinstance(count, BaseException) else count["total"]
+    
+    # Render each card once here so browse clicks within the TTL only fill in the index
+    for channel in channels:
+        render_channel_card(channel)
+    
+    store_cached(
+        channel_page_cache, page_start, (time.monotonic(), channels, total),
+        CHANNEL_CACHE_TTL, CHANNEL_CACHE_MAX_SIZE
+    )
+    return channels, total
+
+
+def render_channel_card(channel: dict):
+    """Pre-render the browse card text and purchase button for a channel"""
     pricing = channel.get("pricing", {})
     
     # Build pricing display
-    pricing_lines = []
-    for ad_type, price in pricing.items():
-        pricing_lines.append(f"  - {ad_type.capitalize()}: {price} USD")
-    
-    pricing_text = "\n".join(pricing_lines) if pricing_lines else "  No pricing set"
+    pricing_text = "\n".join(
+        f"  - {ad_type.capitalize()}: {price} USD" for ad_type, price in pricing.items()
+    ) or "  No pricing set"
     
-    text = (
-        f"Channel {index + 1} of {total}\n\n"
+    channel["card_text"] = (
         f"Channel: {channel['channel_title']}\n"
         f"Username: @{channel.get('channel_username', 'Private')}\n"
         f"Subscribers: {channel.get('subscribers', 0):,}\n"
@@ -679,43 +1175,70 @@ async def show_channel_detail(message, channel: dict, index: int, total: int, us
         f"Status: {channel['status']}"
     )
     
-    # Build navigation keyboard
-    keyboard = []
-    
-    # Purchase button
-    keyboard.append([InlineKeyboardButton(
+    channel["purchase_row"] = [InlineKeyboardButton(
         text="Purchase Ad",
         callback_data=f"purchase_channel_{channel['id']}"
-    )])
+    )]
+    
+    # Ad type buttons for the purchase step, refreshed with the latest pricing
+    build_purchase_keyboard(channel['id'], pricing)
+
+
+def index_browsed_channels(channels: list) -> dict:
+    """Map channel id to the details the purchase step needs"""
+    return {
+        channel['id']: {"channel_title": channel['channel_title'], "pricing": channel['pricing']}
+        for channel in channels
+    }
+
+
+def show_channel_detail(message, channel: dict, index: int, total, has_next: bool, user_id: int):
+    """Build the edit that shows a channel card with purchase button"""
+    label = f"Channel {index + 1}" if total is None else f"Channel {index + 1} of {total}"
+    text = f"{label}\n\n{channel['card_text']}"
+    
+    # Build navigation keyboard
+    keyboard = [channel["purchase_row"]]
     
     # Navigation buttons
     nav_row = []
     if index > 0:
         nav_row.append(InlineKeyboardButton(text="Previous", callback_data=f"channel_nav_{index-1}"))
-    if index < total - 1:
+    if has_next:
         nav_row.append(InlineKeyboardButton(text="Next", callback_data=f"channel_nav_{index+1}"))
     
     if nav_row:
         keyboard.append(nav_row)
     
     # Back button
-    keyboard.append([InlineKeyboardButton(text="Main Menu", callback_data="main_menu")])
+    keyboard.append([MAIN_MENU_BUTTON])
     
-    await message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+    return message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
 
 
 @router.callback_query(F.data.startswith("channel_nav_"))
-async def callback_channel_navigation(callback: CallbackQuery):
+async def callback_channel_navigation(callback: CallbackQuery, state: FSMContext):
     """Handle channel navigation"""
-    index = int(callback.data.split("_")[-1])
+    run_in_background(callback.answer())
     
-    # Fetch channels
-    channels = await api_request("GET", "/channels/")
+    # Ignore repeated taps before the card has had a chance to update
+    now = time.monotonic()
+    user_id = callback.from_user.id
+    if now - last_nav_clicks.get(user_id, (0,))[0] < NAV_DEBOUNCE_SECONDS:
+        return
+    store_cached(last_nav_clicks, user_id, (now,), NAV_DEBOUNCE_SECONDS, NAV_CLICKS_MAX_SIZE)
+    
+    index = int(callback.data.rsplit("_", 1)[1])
     
-    if "error" not in channels and isinstance(channels, list) and len(channels) > index:
-        await show_channel_detail(callback.message, channels[index], index, len(channels), callback.from_user.id)
+    # Fetch the page holding this channel
+    try:
+        channels, total = await fetch_channel_page(index)
+    except ApiError:
+        return callback.message.edit_text(BROWSE_ERROR_TEXT, reply_markup=MAIN_MENU_ONLY_KEYBOARD)
     
-    await callback.answer()
+    if channels:
+        await state.update_data(browsed_channels=index_browsed_channels(channels))
+        return show_channel_detail(callback.message, channels[0], index, total, len(channels) > 1, callback.from_user.id)
 
 
 # ============================================================================
@@ -725,23 +1248,27 @@ async def callback_channel_navigation(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("purchase_channel_"))
 async def callback_purchase_channel(callback: CallbackQuery, state: FSMContext):
     """Start purchase flow for a channel"""
-    channel_id = int(callback.data.split("_")[-1])
+    channel_id = int(callback.data.rsplit("_", 1)[1])
     
-    logger.info(f"Purchase initiated for channel {channel_id} by user {callback.from_user.id}")
+    logger.info("Purchase initiated for channel %s by user %s", channel_id, callback.from_user.id)
     
-    # Fetch channel details
-    channel = await api_request("GET", f"/channels/{channel_id}")
+    # Use the details saved while browsing, fetching only if the user came from elsewhere
+    data = await state.get_data()
+    channel = data.get("browsed_channels", {}).get(channel_id)
     
-    if "error" in channel:
-        await callback.answer("Channel not found", show_alert=True)
-        return
+    if channel is None:
+        try:
+            channel = await api_request("GET", f"/channels/{channel_id}")
+        except ApiError:
+            await callback.answer("Channel not found", show_alert=True)
+            return
     
     # Save channel to state
-    await state.update_data(
-        channel_id=channel_id,
-        channel_title=channel['channel_title'],
-        pricing=channel['pricing']
-    )
+    await set_flow_state(state, PurchaseFlow.selecting_ad_type, {
+        "channel_id": channel_id,
+        "channel_title": channel['channel_title'],
+        "pricing": channel['pricing']
+    })
     
     # Show ad type selection
     pricing = channel['pricing']
@@ -752,32 +1279,26 @@ async def callback_purchase_channel(callback: CallbackQuery, state: FSMContext):
         f"Select ad type:"
     )
     
-    keyboard = []
-    for ad_type, price in pricing.items():
-        keyboard.append([InlineKeyboardButton(
-            text=f"{ad_type.capitalize()} - {price} USD",
-            callback_data=f"select_adtype_{ad_type}"
-        )])
-    
-    keyboard.append([InlineKeyboardButton(text="Cancel", callback_data="browse_channels")])
+    keyboard = purchase_keyboards.get(channel_id) or build_purchase_keyboard(channel_id, pricing)
     
-    await callback.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
-    await state.set_state(PurchaseFlow.selecting_ad_type)
-    await callback.answer()
+    run_in_background(callback.answer())
+    return callback.message.edit_text(text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data.startswith("select_adtype_"), StateFilter(PurchaseFlow.selecting_ad_type))
 async def callback_select_ad_type(callback: CallbackQuery, state: FSMContext):
     """Handle ad type selection"""
-    ad_type = callback.data.split("_")[-1]
+    run_in_background(callback.answer())
+    
+    ad_type = callback.data.rsplit("_", 1)[1]
     
     # Get state data
     data = await state.get_data()
     pricing = data.get('pricing', {})
     price = pricing.get(ad_type, 0)
     
-    # Update state
-    await state.update_data(ad_type=ad_type, price=price)
+    # Update state - data is already loaded, so write it back in one call
+    await set_flow_state(state, PurchaseFlow.confirming_purchase, {**data, "ad_type": ad_type, "price": price})
     
     text = (
         f"Confirm Purchase\n\n"
@@ -787,43 +1308,42 @@ async def callback_select_ad_type(callback: CallbackQuery, state: FSMContext):
         f"Confirm this order?"
     )
     
-    keyboard = [
-        [InlineKeyboardButton(text="Confirm Order", callback_data="confirm_purchase")],
-        [InlineKeyboardButton(text="Cancel", callback_data="browse_channels")]
-    ]
-    
-    await callback.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
-    await state.set_state(PurchaseFlow.confirming_purchase)
-    await callback.answer()
+    return callback.message.edit_text(text, reply_markup=CONFIRM_PURCHASE_KEYBOARD)
 
 
 @router.callback_query(F.data == "confirm_purchase", StateFilter(PurchaseFlow.confirming_purchase))
 async def callback_confirm_purchase(callback: CallbackQuery, state: FSMContext):
     """Confirm and create order"""
+    run_in_background(callback.answer())
+    
     data = await state.get_data()
     
-    logger.info(f"Creating order: channel={data['channel_id']}, type={data['ad_type']}, price={data['price']}")
+    # Leave the confirm step before the POST so a double tap cannot create a second order
+    await state.clear()
     
-    # Create order in database
-    result = await api_request(
-        "POST", "/orders/",
-        json={
-            "buyer_telegram_id": callback.from_user.id,
-            "channel_id": data['channel_id'],
-            "ad_type": data['ad_type'],
-            "price": data['price']
-        }
-    )
+    logger.info("Creating order: channel=%s, type=%s, price=%s", data['channel_id'], data['ad_type'], data['price'])
     
-    if "error" in result:
-        error_msg = str(result.get('error', 'Unknown error'))
-        text = f"ORDER CREATION FAILED\n\n{error_msg}\n\nPlease try again"
-        keyboard = [[InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]]
-        
-        await callback.message.answer("FAILED - Could not create order - Please try again")
+    # Create order in database
+    try:
+        result = await api_request(
+            "POST", "/orders/",
+            json={
+                "buyer_telegram_id": callback.from_user.id,
+                "channel_id": data['channel_id'],
+                "ad_type": data['ad_type'],
+                "price": data['price']
+            }
+        )
+    except ApiError as e:
+        text = f"ORDER CREATION FAILED\n\n{e}\n\nPlease try again"
+        safe_text = "Order creation failed - Please try again"
+        keyboard = MAIN_MENU_ONLY_KEYBOARD
     else:
         order_id = result.get('id')
         
+        # Backend marks the buyer as an advertiser
+        user_cache.pop(callback.from_user.id, None)
+        
         text = (
             "ORDER CREATED SUCCESSFULLY\n\n"
             f"Order ID {order_id}\n"
@@ -833,28 +1353,22 @@ async def callback_confirm_purchase(callback: CallbackQuery, state: FSMContext):
             f"Status Pending Payment\n\n"
             f"Next Complete payment to activate your order"
         )
+        safe_text = f"Order {order_id} created successfully - Click Simulate Payment button"
         
-        keyboard = [
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="Simulate Payment", callback_data=f"pay_order_{order_id}")],
-            [InlineKeyboardButton(text="My Orders", callback_data="my_orders")],
-            [InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]
-        ]
+            [MY_ORDERS_BUTTON],
+            [MAIN_MENU_BUTTON]
+        ])
         
-        logger.info(f"Order created: {order_id}")
-        await callback.message.answer("SUCCESS - Order created - Proceed to payment")
+        logger.info("Order created: %s", order_id)
     
+    # Replace the confirmation prompt with the result
     try:
-        await callback.message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
-    except Exception as e:
-        logger.error(f"Failed to send message: {e}")
-        safe_text = f"Order {order_id} created successfully - Click Simulate Payment button"
-        await callback.message.answer(safe_text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+        await callback.message.edit_text(text, reply_markup=keyboard)
     except Exception as e:
-        logger.error(f"Failed to send message: {e}")
-        await callback.message.answer(text)
-    
-    await state.clear()
-    await callback.answer()
+        logger.error("Failed to edit message: %s", e)
+        await callback.message.answer(safe_text, reply_markup=keyboard)
 
 
 # ============================================================================
@@ -864,65 +1378,44 @@ async def callback_confirm_purchase(callback: CallbackQuery, state: FSMContext):
 @router.callback_query(F.data.startswith("pay_order_"))
 async def callback_pay_order(callback: CallbackQuery):
     """Simulate payment for an order"""
-    from datetime import datetime
-    order_id = int(callback.data.split("_")[-1])
+    run_in_background(callback.answer())
     
-    logger.info(f"Payment simulation for order {order_id}")
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    # Update order status to paid
-    result = await api_request(
-        "PATCH", f"/orders/{order_id}",
-        json={
-            "status": "paid",
-            "payment_method": "simulated",
-            "payment_transaction_id": f"SIM{order_id}_{int(datetime.utcnow().timestamp())}",
-            "paid_at": datetime.utcnow().isoformat()
-        }
-    )
+    logger.info("Payment simulation for order %s", order_id)
     
-    if "error" in result:
-        # Payment failed
-        error_msg = str(result.get('error', 'Unknown error'))
-        text = (
-            "PAYMENT FAILED\n\n"
-            f"Order ID {order_id}\n"
-            f"Error {error_msg}\n\n"
-            "Please try again or contact support"
+    now = datetime.now(timezone.utc)
+    
+    # Update order status to paid
+    try:
+        await api_request(
+            "PATCH", f"/orders/{order_id}",
+            json={
+                "status": "paid",
+                "payment_method": "simulated",
+                "payment_transaction_id": f"SIM{order_id}_{int(now.timestamp())}",
+                "paid_at": now.isoformat()
+            }
         )
-        logger.error(f"Payment failed for order {order_id}: {error_msg}")
-        
-        await callback.message.answer("PAYMENT FAILED - Please try again")
-        
+    except ApiError as e:
+        # Payment failed
+        error_msg = str(e)
+        text = PAYMENT_FAILED_TEMPLATE.format(order_id=order_id, error=error_msg)
+        safe_text = f"Payment failed - Order {order_id} - Please try again"
+        logger.error("Payment failed for order %s: %s", order_id, error_msg)
     else:
         # Payment successful
-        tx_id = result.get('payment_transaction_id', 'N/A')
-        text = (
-            "PAYMENT SUCCESSFUL\n\n"
-            f"Order ID {order_id}\n"
-            f"Status Paid\n\n"
-            "Your order is now being processed\n"
-            "Next step Submit your ad creative\n\n"
-            "Go to My Orders to submit creative"
-        )
+        text = PAYMENT_SUCCESS_TEMPLATE.format(order_id=order_id)
+        safe_text = f"Payment complete - Order {order_id} - Check My Orders"
         
-        logger.info(f"Order {order_id} paid successfully")
-        
-        await callback.message.answer("SUCCESS - Payment completed - Your order is confirmed - Submit creative next")
-    
-    keyboard = [
-        [InlineKeyboardButton(text="My Orders", callback_data="my_orders")],
-        [InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]
-    ]
+        logger.info("Order %s paid successfully", order_id)
     
-    # Send details as new message
+    # Show details in place of the order message, which drops its pay button
     try:
-        await callback.message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+        await callback.message.edit_text(text, reply_markup=MY_ORDERS_MAIN_MENU_KEYBOARD)
     except Exception as e:
-        logger.error(f"Failed to send message: {e}")
-        # Ultra safe fallback - absolute bare minimum
-        await callback.message.answer(f"Payment complete - Order {order_id} - Check My Orders")
-    
-    await callback.answer()
+        logger.error("Failed to edit message: %s", e)
+        await callback.message.answer(safe_text, reply_markup=MY_ORDERS_MAIN_MENU_KEYBOARD)
 
 
 # ============================================================================
@@ -932,41 +1425,41 @@ async def callback_pay_order(callback: CallbackQuery):
 @router.callback_query(F.data == "my_orders")
 async def callback_my_orders(callback: CallbackQuery):
     """Show user's orders with action buttons"""
-    logger.info(f"my_orders from {callback.from_user.id}")
+    logger.info("my_orders from %s", callback.from_user.id)
+    
+    run_in_background(callback.answer())
     
-    # Fetch orders from database
-    orders = await api_request("GET", f"/orders/user/{callback.from_user.id}")
+    # Fetch only the listed orders, with the total counted separately
+    orders, count = await asyncio.gather(
+        api_request("GET", f"/orders/user/{callback.from_user.id}", params={"limit": MY_ORDERS_PAGE_SIZE}),
+        api_request("GET", f"/orders/user/{callback.from_user.id}/count"),
+        return_exceptions=True
+    )
     
-    if "error" in orders or not orders:
+    if isinstance(orders, BaseException):
+        orders = []
+    
+    if not orders:
         text = (
             "My Orders\n\n"
             "You have not placed any orders yet\n\n"
             "Browse channels to get started"
         )
-        keyboard = [
-            [InlineKeyboardButton(text="Browse Channels", callback_data="browse_channels")],
-            [InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]
-        ]
+        markup = NO_ORDERS_KEYBOARD
     else:
-        text = f"My Orders ({len(orders)} total)\n\n"
+        # Without the count, show the listed orders and skip the "more" line
+        total = len(orders) if isinstance(count, BaseException) else count["total"]
+        parts = [f"My Orders ({total} total)\n\n"]
         
         keyboard = []
         
-        for order in orders[:5]:  # Show only 5 most recent
-            status_emoji = {
-                "pending_payment": "Pending Payment",
-                "paid": "Paid - Submit Creative",
-                "creative_submitted": "Creative Submitted",
-                "creative_approved": "Approved - Posting Soon",
-                "posted": "Posted",
-                "completed": "Completed",
-                "cancelled": "Cancelled",
-                "refunded": "Refunded"
-            }.get(order["status"], "Unknown")
-            
-            text += f"Order {order['id']} - {order['ad_type'].capitalize()}\n"
-            text += f"Status {status_emoji}\n"
-            text += f"Price {order['price']} USD\n\n"
+        for order in orders:
+            parts.append(ORDER_ROW_TEMPLATE.format(
+                id=order['id'],
+                ad_type=order['ad_type'].capitalize(),
+                status=ORDER_STATUS_LABELS.get(order["status"], "Unknown"),
+                price=order['price']
+            ))
             
             # Add action button based on status
             if order["status"] == "pending_payment":
@@ -979,25 +1472,26 @@ async def callback_my_orders(callback: CallbackQuery):
                     text=f"Submit Creative for Order {order['id']}",
                     callback_data=f"submit_creative_{order['id']}"
                 )])
-            elif order["status"] in ["creative_submitted", "creative_approved", "posted"]:
+            elif order["status"] in VIEWABLE_ORDER_STATUSES:
                 keyboard.append([InlineKeyboardButton(
                     text=f"View Order {order['id']} Details",
                     callback_data=f"view_order_{order['id']}"
                 )])
         
-        if len(orders) > 5:
-            text += f"...and {len(orders) - 5} more orders"
+        if total > len(orders):
+            parts.append(f"...and {total - len(orders)} more orders")
         
-        keyboard.append([InlineKeyboardButton(text="Browse Channels", callback_data="browse_channels")])
-        keyboard.append([InlineKeyboardButton(text="Main Menu", callback_data="main_menu")])
+        text = "".join(parts)
+        
+        keyboard.append([BROWSE_CHANNELS_BUTTON])
+        keyboard.append([MAIN_MENU_BUTTON])
+        markup = InlineKeyboardMarkup(inline_keyboard=keyboard)
     
     try:
-        await callback.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+        await callback.message.edit_text(text, reply_markup=markup)
     except Exception as e:
-        logger.error(f"Failed to edit message: {e}")
-        await callback.message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
-    
-    await callback.answer()
+        logger.error("Failed to edit message: %s", e)
+        await callback.message.answer(text, reply_markup=markup)
 
 
 # ============================================================================
@@ -1007,12 +1501,12 @@ async def callback_my_orders(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("submit_creative_"))
 async def callback_submit_creative(callback: CallbackQuery, state: FSMContext):
     """Start creative submission process"""
-    order_id = int(callback.data.split("_")[-1])
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    logger.info(f"Creative submission started for order {order_id}")
+    logger.info("Creative submission started for order %s", order_id)
     
     # Save order ID to state
-    await state.update_data(order_id=order_id)
+    await set_flow_state(state, CreativeSubmission.waiting_for_content, {"order_id": order_id})
     
     text = (
         f"Submit Creative for Order {order_id}\n\n"
@@ -1023,8 +1517,7 @@ async def callback_submit_creative(callback: CallbackQuery, state: FSMContext):
     )
     
     await callback.message.answer(text)
-    await state.set_state(CreativeSubmission.waiting_for_content)
-    await callback.answer("Send your ad text now")
+    run_in_background(callback.answer("Send your ad text now"))
 
 
 @router.message(StateFilter(CreativeSubmission.waiting_for_content))
@@ -1043,9 +1536,9 @@ async def process_creative_content(message: Message, state: FSMContext):
     order_id = data.get('order_id')
     
     # Save content to state
-    await state.update_data(creative_content=message.text)
+    await set_flow_state(state, CreativeSubmission.waiting_for_media, {**data, "creative_content": message.text})
     
-    logger.info(f"Creative content received for order {order_id}")
+    logger.info("Creative content received for order %s", order_id)
     
     text = (
         f"Ad Text Received\n\n"
@@ -1056,7 +1549,6 @@ async def process_creative_content(message: Message, state: FSMContext):
     )
     
     await message.answer(text)
-    await state.set_state(CreativeSubmission.waiting_for_media)
 
 
 @router.message(StateFilter(CreativeSubmission.waiting_for_media))
@@ -1066,52 +1558,44 @@ async def process_creative_media(message: Message, state: FSMContext):
     order_id = data.get('order_id')
     creative_content = data.get('creative_content')
     
-    if message.text:
-        if message.text.startswith("/cancel"):
-            await message.answer("Creative submission cancelled")
-            await state.clear()
-            return
-        elif message.text.startswith("/skip"):
-            # Submit without media
-            creative_media_id = None
-        else:
-            await message.answer("Please send a photo or video, or /skip")
-            return
+    text = message.text or ""
+    
+    if text.startswith("/cancel"):
+        await message.answer("Creative submission cancelled")
+        await state.clear()
+        return
+    
+    if text.startswith("/skip"):
+        # Submit without media
+        creative_media_id = None
     elif message.photo:
         # Get the largest photo
         creative_media_id = message.photo[-1].file_id
-        logger.info(f"Photo received for order {order_id}: {creative_media_id}")
+        logger.info("Photo received for order %s: %s", order_id, creative_media_id)
     elif message.video:
         creative_media_id = message.video.file_id
-        logger.info(f"Video received for order {order_id}: {creative_media_id}")
+        logger.info("Video received for order %s: %s", order_id, creative_media_id)
     else:
         await message.answer("Please send a photo or video, or /skip")
         return
     
     # Update order with creative
-    result = await api_request(
-        "PATCH", f"/orders/{order_id}",
-        json={
-            "creative_content": creative_content,
-            "creative_media_id": creative_media_id,
-            "status": "creative_submitted"
-        }
-    )
-    
-    if "error" in result:
-        await message.answer(f"Failed to submit creative - {result.get('error')}")
-    else:
-        text = (
-            f"CREATIVE SUBMITTED SUCCESSFULLY\n\n"
-            f"Order ID {order_id}\n"
-            f"Status Waiting for approval\n\n"
-            f"The channel owner will review your creative\n"
-            f"You will be notified when it is approved"
+    try:
+        await api_request(
+            "PATCH", f"/orders/{order_id}",
+            json={
+                "creative_content": creative_content,
+                "creative_media_id": creative_media_id,
+                "status": "creative_submitted"
+            }
         )
-        await message.answer(text)
+    except ApiError as e:
+        await message.answer(f"Failed to submit creative - {e}")
+    else:
+        await message.answer(CREATIVE_SUBMITTED_TEMPLATE.format(order_id=order_id))
         await message.answer("SUCCESS - Creative submitted - Channel owner will review it")
         
-        logger.info(f"Creative submitted for order {order_id}")
+        logger.info("Creative submitted for order %s", order_id)
     
     await state.clear()
 
@@ -1123,72 +1607,83 @@ async def process_creative_media(message: Message, state: FSMContext):
 @router.callback_query(F.data == "pending_orders")
 async def callback_pending_orders(callback: CallbackQuery):
     """Show pending orders for channel owner to approve"""
-    logger.info(f"pending_orders from {callback.from_user.id}")
+    logger.info("pending_orders from %s", callback.from_user.id)
+    
+    run_in_background(callback.answer())
     
     # Get user's channels
-    channels = await api_request("GET", f"/channels/owner/{callback.from_user.id}")
+    try:
+        channels = await get_owner_channels_cached(callback.from_user.id)
+    except ApiError:
+        channels = []
     
-    if "error" in channels or not channels:
+    if not channels:
         await callback.message.answer("You have no channels - Add a channel first")
-        await callback.answer()
         return
     
     # Get channel IDs
     channel_ids = [ch['id'] for ch in channels]
     
-    # Get all orders for these channels with creative_submitted status
+    # Get creative_submitted orders for these channels concurrently
+    results = await asyncio.gather(
+        *(
+            api_request("GET", f"/orders/channel/{channel_id}", params={"status": "creative_submitted"})
+            for channel_id in channel_ids
+        ),
+        return_exceptions=True
+    )
+    
+    # Skip channels that failed
     all_orders = []
-    for channel_id in channel_ids:
-        orders = await api_request("GET", f"/orders/channel/{channel_id}")
-        if "error" not in orders and orders:
-            # Filter for creative_submitted status
-            pending = [o for o in orders if o.get('status') == 'creative_submitted']
-            all_orders.extend(pending)
+    for orders in results:
+        if isinstance(orders, BaseException) or not orders:
+            continue
+        all_orders.extend(orders)
     
     if not all_orders:
         text = "Pending Orders\n\nNo pending orders to review"
-        keyboard = [[InlineKeyboardButton(text="Main Menu", callback_data="main_menu")]]
+        markup = MAIN_MENU_ONLY_KEYBOARD
     else:
-        text = f"Pending Orders ({len(all_orders)} total)\n\nOrders waiting for your approval:\n\n"
+        parts = [f"Pending Orders ({len(all_orders)} total)\n\nOrders waiting for your approval:\n\n"]
         
         keyboard = []
         
         for order in all_orders[:5]:
-            text += f"Order {order['id']} - {order['ad_type'].capitalize()}\n"
-            text += f"Price {order['price']} USD\n"
-            text += f"Status Creative Submitted\n\n"
+            parts.append(PENDING_ORDER_ROW_TEMPLATE.format(
+                id=order['id'],
+                ad_type=order['ad_type'].capitalize(),
+                price=order['price']
+            ))
             
             keyboard.append([InlineKeyboardButton(
                 text=f"Review Order {order['id']}",
                 callback_data=f"review_order_{order['id']}"
             )])
         
-        keyboard.append([InlineKeyboardButton(text="Main Menu", callback_data="main_menu")])
+        text = "".join(parts)
+        keyboard.append([MAIN_MENU_BUTTON])
+        markup = InlineKeyboardMarkup(inline_keyboard=keyboard)
     
     try:
-        await callback.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+        await callback.message.edit_text(text, reply_markup=markup)
     except:
-        await callback.message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
-    
-    await callback.answer()
+        await callback.message.answer(text, reply_markup=markup)
 
 
 @router.callback_query(F.data.startswith("review_order_"))
 async def callback_review_order(callback: CallbackQuery):
     """Review and approve/reject order creative"""
-    order_id = int(callback.data.split("_")[-1])
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    logger.info(f"Reviewing order {order_id}")
+    logger.info("Reviewing order %s", order_id)
     
     # Get order details
-    result = await api_request("GET", f"/orders/{order_id}")
-    
-    if "error" in result:
+    try:
+        order = await api_request("GET", f"/orders/{order_id}")
+    except ApiError:
         await callback.answer("Order not found", show_alert=True)
         return
     
-    order = result
-    
     text = (
         f"Review Order {order_id}\n\n"
         f"Ad Type {order['ad_type'].capitalize()}\n"
@@ -1217,38 +1712,36 @@ async def callback_review_order(callback: CallbackQuery):
     try:
         await callback.message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
     except Exception as e:
-        logger.error(f"Failed to send message: {e}")
+        logger.error("Failed to send message: %s", e)
         safe_text = f"Review Order {order_id} - {order['ad_type']} - {order['price']} USD"
         await callback.message.answer(safe_text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
     
-    await callback.answer()
+    run_in_background(callback.answer())
 
 
 @router.callback_query(F.data.startswith("approve_order_"))
 async def callback_approve_order(callback: CallbackQuery):
     """Approve order and post ad to channel"""
-    order_id = int(callback.data.split("_")[-1])
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    logger.info(f"Approving order {order_id}")
+    logger.info("Approving order %s", order_id)
     
     # Get order details
-    order_result = await api_request("GET", f"/orders/{order_id}")
-    
-    if "error" in order_result:
+    try:
+        order = await api_request("GET", f"/orders/{order_id}")
+    except ApiError:
         await callback.answer("Order not found", show_alert=True)
         return
     
-    order = order_result
     channel_id = order['channel_id']
     
     # Get channel details
-    channel_result = await api_request("GET", f"/channels/{channel_id}")
-    
-    if "error" in channel_result:
+    try:
+        channel = await api_request("GET", f"/channels/{channel_id}")
+    except ApiError:
         await callback.answer("Channel not found", show_alert=True)
         return
     
-    channel = channel_result
     telegram_channel_id = channel['telegram_channel_id']
     
     # Post ad to channel
@@ -1277,46 +1770,51 @@ async def callback_approve_order(callback: CallbackQuery):
         else:
             post_url = f"Posted to channel {channel['channel_title']}"
         
-        logger.info(f"Ad posted for order {order_id}: {post_url}")
+        logger.info("Ad posted for order %s: %s", order_id, post_url)
         
-        # Update order status
-        await api_request(
-            "PATCH", f"/orders/{order_id}",
-            json={
-                "status": "posted",
-                "post_url": post_url,
-                "completed_at": datetime.utcnow().isoformat()
-            }
-        )
+        # Update order status - the ad is already live, so only log failures
+        try:
+            await api_request(
+                "PATCH", f"/orders/{order_id}",
+                json={
+                    "status": "posted",
+                    "post_url": post_url,
+                    "completed_at": datetime.now(timezone.utc).isoformat()
+                }
+            )
+        except ApiError as e:
+            logger.error("Failed to mark order %s as posted: %s", order_id, e)
         
         await callback.message.answer(f"SUCCESS - Ad posted to channel successfully")
         await callback.message.answer(f"Order {order_id} completed\nPost URL: {post_url}")
         
     except Exception as e:
-        logger.error(f"Failed to post ad: {e}")
+        logger.error("Failed to post ad: %s", e)
+        # Posting may have failed because the bot lost its admin rights
+        invalidate_admin_status(callback.bot.id, telegram_channel_id)
         await callback.message.answer(f"FAILED - Could not post ad: {str(e)}")
     
-    await callback.answer()
+    run_in_background(callback.answer())
 
 
 @router.callback_query(F.data.startswith("reject_order_"))
 async def callback_reject_order(callback: CallbackQuery):
     """Reject order creative"""
-    order_id = int(callback.data.split("_")[-1])
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    logger.info(f"Rejecting order {order_id}")
+    logger.info("Rejecting order %s", order_id)
     
     # Update order status back to paid so user can resubmit
-    result = await api_request(
-        "PATCH", f"/orders/{order_id}",
-        json={"status": "paid"}
-    )
-    
-    if "error" in result:
+    try:
+        await api_request(
+            "PATCH", f"/orders/{order_id}",
+            json={"status": "paid"}
+        )
+    except ApiError:
         await callback.answer("Failed to reject order", show_alert=True)
     else:
         await callback.message.answer(f"Order {order_id} rejected - Advertiser can resubmit creative")
-        await callback.answer("Order rejected")
+        run_in_background(callback.answer("Order rejected"))
     
 
 
@@ -1327,52 +1825,43 @@ async def callback_reject_order(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("view_order_"))
 async def callback_view_order(callback: CallbackQuery):
     """View order details"""
-    order_id = int(callback.data.split("_")[-1])
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    result = await api_request("GET", f"/orders/{order_id}")
-    
-    if "error" in result:
+    try:
+        order = await api_request("GET", f"/orders/{order_id}")
+    except ApiError:
         await callback.answer("Order not found", show_alert=True)
         return
     
-    order = result
+    status_text = ORDER_DETAIL_STATUS_LABELS.get(order['status'], order['status'])
     
-    status_text = {
-        "pending_payment": "Pending Payment",
-        "paid": "Paid - Awaiting Creative",
-        "creative_submitted": "Creative Submitted - Under Review",
-        "posted": "Posted to Channel",
-        "completed": "Completed",
-        "cancelled": "Cancelled"
-    }.get(order['status'], order['status'])
-    
-    text = (
+    parts = [
         f"Order Details\n\n"
         f"Order ID {order['id']}\n"
         f"Ad Type {order['ad_type'].capitalize()}\n"
         f"Price {order['price']} USD\n"
         f"Status {status_text}\n\n"
-    )
+    ]
     
     if order.get('creative_content'):
-        text += f"Ad Text\n{order['creative_content']}\n\n"
+        parts.append(f"Ad Text\n{order['creative_content']}\n\n")
     
     if order.get('post_url'):
-        text += f"Post URL {order['post_url']}\n\n"
+        parts.append(f"Post URL {order['post_url']}\n\n")
     
     if order.get('payment_transaction_id'):
-        text += f"Transaction {order['payment_transaction_id']}\n"
+        parts.append(f"Transaction {order['payment_transaction_id']}\n")
     
-    keyboard = [[InlineKeyboardButton(text="My Orders", callback_data="my_orders")]]
+    text = "".join(parts)
     
     try:
-        await callback.message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+        await callback.message.answer(text, reply_markup=MY_ORDERS_KEYBOARD)
     except Exception as e:
-        logger.error(f"Failed to send message: {e}")
+        logger.error("Failed to send message: %s", e)
         safe_text = f"Order {order['id']} - Status {status_text}"
-        await callback.message.answer(safe_text, reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+        await callback.message.answer(safe_text, reply_markup=MY_ORDERS_KEYBOARD)
     
-    await callback.answer()
+    run_in_background(callback.answer())
 
 
 # ============================================================================
@@ -1382,23 +1871,23 @@ async def callback_view_order(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("cancel_order_"))
 async def callback_cancel_order(callback: CallbackQuery):
     """Cancel an unpaid order"""
-    order_id = int(callback.data.split("_")[-1])
+    order_id = int(callback.data.rsplit("_", 1)[1])
     
-    logger.info(f"Cancelling order {order_id}")
+    logger.info("Cancelling order %s", order_id)
     
     # Update order status
-    result = await api_request(
-        "PATCH", f"/orders/{order_id}",
-        json={"status": "cancelled"}
-    )
-    
-    if "error" in result:
+    try:
+        await api_request(
+            "PATCH", f"/orders/{order_id}",
+            json={"status": "cancelled"}
+        )
+    except ApiError:
         await callback.answer("Failed to cancel order", show_alert=True)
     else:
         await callback.message.answer(f"Order {order_id} cancelled successfully")
         await callback.answer("Order cancelled")
         
-        logger.info(f"Order {order_id} cancelled")
+        logger.info("Order %s cancelled", order_id)
 
 
 # ============================================================================
@@ -1408,20 +1897,23 @@ async def callback_cancel_order(callback: CallbackQuery):
 @router.callback_query(F.data == "main_menu")
 async def callback_main_menu(callback: CallbackQuery, state: FSMContext):
     """Return to main menu"""
-    logger.info(f"main_menu from {callback.from_user.id}")
+    logger.info("main_menu from %s", callback.from_user.id)
+    
+    run_in_background(callback.answer())
+    
     await state.clear()
     
     # Get user info from database
-    result = await api_request("GET", f"/users/{callback.from_user.id}")
-    
-    if "error" in result:
+    try:
+        result = await get_user_cached(callback.from_user.id)
+    except ApiError:
         is_owner = False
         is_advertiser = False
     else:
         is_owner = result.get("is_channel_owner", False)
         is_advertiser = result.get("is_advertiser", False)
     
-    keyboard = create_main_menu_keyboard(is_owner, is_advertiser)
+    keyboard = MAIN_MENU_KEYBOARDS[bool(is_owner), bool(is_advertiser)]
     
     text = "Main Menu\n\nWhat would you like to do?"
     
@@ -1429,12 +1921,22 @@ async def callback_main_menu(callback: CallbackQuery, state: FSMContext):
         await callback.message.edit_text(text, reply_markup=keyboard)
     except:
         await callback.message.answer(text, reply_markup=keyboard)
-    
-    await callback.answer()
+
+
+async def prewarm_backend():
+    """Send one cheap request so the backend is warm before users arrive"""
+    await api_request("GET", "/health")
 
 
 def setup_handlers(dp):
-    """Register handlers"""
+    """Register handlers and prewarm the backend connection"""
     dp.include_router(router)
+    
+    # Open the backend session with polling and close it when polling stops
+    dp.startup.register(get_session)
+    dp.shutdown.register(close_session)
+    
+    # Hit a cheap endpoint before users arrive so the first /start is not slowed down
+    run_in_background(prewarm_backend())
     logger.info("Router registered with dispatcher")
     logger.info("Registered handlers with PHASE 4: FINAL PRODUCTION POLISH")
@@ -3,7 +3,7 @@ FastAPI Backend with Database Integration - PHASE 1
 Complete API endpoints for user and channel management
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, FileResponse
 from sqlalchemy.orm import Session
@@ -14,6 +14,7 @@ from typing import Optional, List
 from pathlib import Path
 import logging
 import asyncio
+import hmac
 import os
 
 from database import engine, get_db, init_db, SessionLocal
@@ -21,7 +22,7 @@ from models import Base, User, Channel, Order, ChannelStats
 import bot
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 
@@ -76,11 +77,11 @@ async def lifespan(app: FastAPI):
             db.commit()
             logger.info("✅ Migrations completed")
         except Exception as e:
-            logger.warning(f"Migration note: {str(e)[:80]}")
+            logger.warning("Migration note: %s", str(e)[:80])
         finally:
             db.close()
     except Exception as e:
-        logger.error(f"Migration error: {e}")
+        logger.error("Migration error: %s", e)
     
     logger.info("✅ Database initialized")
     
@@ -137,7 +138,7 @@ async def serve_webapp():
             return FileResponse(html_path)
         return HTMLResponse("<h1>Web App UI - Coming Soon</h1>")
     except Exception as e:
-        logger.error(f"Error serving webapp: {e}")
+        logger.error("Error serving webapp: %s", e)
         return HTMLResponse("<h1>Error loading Web App</h1>")
 
 
@@ -158,6 +159,25 @@ async def health_check(db: Session = Depends(get_db)):
     }
 
 
+# ============================================================================
+# TELEGRAM WEBHOOK
+# ============================================================================
+
+@app.post(bot.WEBHOOK_PATH)
+async def telegram_webhook(request: Request):
+    """Receive Telegram updates when the bot runs in webhook mode"""
+    # Not mounted in polling mode, and never open without a secret to check
+    if not bot.WEBHOOK_URL or not bot.WEBHOOK_SECRET:
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+    if not hmac.compare_digest(token.encode(), bot.WEBHOOK_SECRET.encode()):
+        raise HTTPException(status_code=403, detail="Invalid secret token")
+    
+    reply = await bot.feed_webhook_update(await request.json())
+    return Response(content=reply, media_type="application/x-www-form-urlencoded")
+
+
 # ============================================================================
 # USER ENDPOINTS
 # ============================================================================
@@ -170,13 +190,13 @@ async def create_or_get_user(
     db: Session = Depends(get_db)
 ):
     """Create or get user by Telegram ID"""
-    logger.info(f"📝 User request: telegram_id={telegram_id}")
+    logger.info("📝 User request: telegram_id=%s", telegram_id)
     
     # Check if user exists
     user = db.query(User).filter(User.telegram_id == telegram_id).first()
     
     if user:
-        logger.info(f"✅ User exists: {user.id}")
+        logger.info("✅ User exists: %s", user.id)
         return {
             "id": user.id,
             "telegram_id": user.telegram_id,
@@ -197,7 +217,7 @@ async def create_or_get_user(
     db.commit()
     db.refresh(user)
     
-    logger.info(f"✅ User created: {user.id}")
+    logger.info("✅ User created: %s", user.id)
     
     return {
         "id": user.id,
@@ -210,6 +230,52 @@ async def create_or_get_user(
     }
 
 
+@app.post("/users/batch")
+async def create_or_get_users_batch(
+    users_data: List[dict],
+    db: Session = Depends(get_db)
+):
+    """Create or get many users by Telegram ID in one request"""
+    logger.info("📝 Batch user request: %s users", len(users_data))
+    
+    telegram_ids = {u.get("telegram_id") for u in users_data}
+    users = {
+        user.telegram_id: user
+        for user in db.query(User).filter(User.telegram_id.in_(telegram_ids)).all()
+    }
+    
+    # Create missing users
+    for user_data in users_data:
+        telegram_id = user_data.get("telegram_id")
+        if telegram_id not in users:
+            user = User(
+                telegram_id=telegram_id,
+                username=user_data.get("username", ""),
+                first_name=user_data.get("first_name", "")
+            )
+            db.add(user)
+            users[telegram_id] = user
+    
+    db.commit()
+    
+    logger.info("✅ Batch users ready: %s", len(users))
+    
+    result = []
+    for user_data in users_data:
+        user = users[user_data.get("telegram_id")]
+        result.append({
+            "id": user.id,
+            "telegram_id": user.telegram_id,
+            "username": user.username,
+            "first_name": user.first_name,
+            "is_channel_owner": user.is_channel_owner,
+            "is_advertiser": user.is_advertiser,
+            "created_at": user.created_at.isoformat()
+        })
+    
+    return result
+
+
 @app.get("/users/{telegram_id}")
 async def get_user(telegram_id: int, db: Session = Depends(get_db)):
     """Get user by Telegram ID"""
@@ -294,7 +360,7 @@ async def create_channel(
     channel_username = channel_data.get("channel_username")
     pricing = channel_data.get("pricing", {})
     
-    logger.info(f"📢 Channel creation: {channel_title} ({telegram_channel_id})")
+    logger.info("📢 Channel creation: %s (%s)", channel_title, telegram_channel_id)
     
     # Get or create owner
     owner = db.query(User).filter(User.telegram_id == owner_telegram_id).first()
@@ -315,7 +381,7 @@ async def create_channel(
     ).first()
     
     if existing:
-        logger.info(f"⚠️ Channel already exists: {existing.id}")
+        logger.info("⚠️ Channel already exists: %s", existing.id)
         raise HTTPException(status_code=400, detail="Channel already exists")
     
     # Create channel
@@ -335,7 +401,7 @@ async def create_channel(
     db.add(stats)
     db.commit()
     
-    logger.info(f"✅ Channel created: {channel.id}")
+    logger.info("✅ Channel created: %s", channel.id)
     
     return {
         "id": channel.id,
@@ -353,12 +419,13 @@ async def create_channel(
 async def list_channels(
     status: str = "active",
     limit: int = 50,
+    offset: int = 0,
     db: Session = Depends(get_db)
 ):
-    """List all active channels"""
+    """List all active channels (paginated with limit/offset)"""
     channels = db.query(Channel).filter(
         Channel.status == status
-    ).limit(limit).all()
+    ).order_by(Channel.id).offset(offset).limit(limit).all()
     
     result = []
     for channel in channels:
@@ -377,6 +444,14 @@ async def list_channels(
     return result
 
 
+@app.get("/channels/count")
+async def count_channels(status: str = "active", db: Session = Depends(get_db)):
+    """Count channels with a status without loading them"""
+    total = db.query(Channel).filter(Channel.status == status).count()
+    
+    return {"total": total}
+
+
 @app.get("/channels/{channel_id}")
 async def get_channel(channel_id: int, db: Session = Depends(get_db)):
     """Get channel by ID"""
@@ -439,7 +514,7 @@ async def create_order(
     ad_type = order_data.get("ad_type")
     price = order_data.get("price")
     
-    logger.info(f"🛒 Order creation: channel={channel_id}, type={ad_type}")
+    logger.info("🛒 Order creation: channel=%s, type=%s", channel_id, ad_type)
     
     # Get or create buyer
     buyer = db.query(User).filter(User.telegram_id == buyer_telegram_id).first()
@@ -471,7 +546,7 @@ async def create_order(
     db.commit()
     db.refresh(order)
     
-    logger.info(f"✅ Order created: {order.id}")
+    logger.info("✅ Order created: %s", order.id)
     
     return {
         "id": order.id,
@@ -485,14 +560,19 @@ async def create_order(
 
 
 @app.get("/orders/user/{telegram_id}")
-async def get_user_orders(telegram_id: int, db: Session = Depends(get_db)):
-    """Get all orders for a user"""
+async def get_user_orders(
+    telegram_id: int,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Get a user's orders, newest first (all of them unless limit is given)"""
     user = db.query(User).filter(User.telegram_id == telegram_id).first()
     
     if not user:
         return []
     
-    orders = db.query(Order).filter(Order.buyer_id == user.id).order_by(Order.created_at.desc()).all()
+    orders = db.query(Order).filter(Order.buyer_id == user.id).order_by(Order.created_at.desc()).offset(offset).limit(limit).all()
     
     result = []
     for order in orders:
@@ -515,6 +595,16 @@ async def get_user_orders(telegram_id: int, db: Session = Depends(get_db)):
     return result
 
 
+@app.get("/orders/user/{telegram_id}/count")
+async def count_user_orders(telegram_id: int, db: Session = Depends(get_db)):
+    """Count a user's orders without loading them"""
+    total = db.query(Order).join(User, Order.buyer_id == User.id).filter(
+        User.telegram_id == telegram_id
+    ).count()
+    
+    return {"total": total}
+
+
 @app.get("/orders/{order_id}")
 async def get_order(order_id: int, db: Session = Depends(get_db)):
     """Get single order by ID"""
@@ -548,9 +638,18 @@ async def get_order(order_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/orders/channel/{channel_id}")
-async def get_channel_orders(channel_id: int, db: Session = Depends(get_db)):
-    """Get all orders for a channel"""
-    orders = db.query(Order).filter(Order.channel_id == channel_id).order_by(Order.created_at.desc()).all()
+async def get_channel_orders(
+    channel_id: int,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a channel's orders, optionally only those in a comma-separated list of statuses"""
+    query = db.query(Order).filter(Order.channel_id == channel_id)
+    
+    if status:
+        query = query.filter(Order.status.in_(status.split(",")))
+    
+    orders = query.order_by(Order.created_at.desc()).all()
     
     result = []
     for order in orders:
@@ -596,13 +695,13 @@ async def update_order(
             order.escrow_amount = order.final_price or order.price
             order.escrow_held_at = datetime.now(timezone.utc)
             order.paid_at = datetime.now(timezone.utc)
-            logger.info(f"💰 Escrow held: ${order.escrow_amount} for order {order.id}")
+            logger.info("💰 Escrow held: $%s for order %s", order.escrow_amount, order.id)
             
         elif new_status == "posted" and old_status == "creative_submitted":
             # Creative approved → Auto-post and mark for delivery confirmation
             order.auto_posted = True
             order.auto_posted_at = datetime.now(timezone.utc)
-            logger.info(f"📢 Auto-posted order {order.id}")
+            logger.info("📢 Auto-posted order %s", order.id)
     
     if "payment_method" in update_data:
         order.payment_method = update_data["payment_method"]
@@ -680,7 +779,7 @@ async def confirm_delivery(
     db.commit()
     db.refresh(order)
     
-    logger.info(f"✅ Delivery confirmed and escrow released: ${order.escrow_amount} for order {order.id}")
+    logger.info("✅ Delivery confirmed and escrow released: $%s for order %s", order.escrow_amount, order.id)
     
     return {
         "id": order.id,
@@ -723,7 +822,7 @@ async def refund_order(
     db.commit()
     db.refresh(order)
     
-    logger.info(f"💸 Order refunded: ${order.escrow_amount} returned to buyer for order {order.id}")
+    logger.info("💸 Order refunded: $%s returned to buyer for order %s", order.escrow_amount, order.id)
     
     return {
         "id": order.id,
@@ -1081,5 +1180,13 @@ async def get_channel_analytics(channel_id: int, days: int = 30, db: Session = D
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 10000))
-    logger.info(f"Starting server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    
+    # uvloop comes with uvicorn[standard]; fall back to asyncio if missing
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    logger.info("Starting server on port %s (%s event loop)", port, loop)
+    uvicorn.run(app, host="0.0.0.0", port=port, loop=loop)
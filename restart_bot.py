@@ -27,17 +27,17 @@ async def nuclear_restart():
     for i in range(10):
         try:
             await bot.delete_webhook(drop_pending_updates=True)
-            logger.info(f"✅ Webhook deleted attempt {i+1}")
+            logger.info("✅ Webhook deleted attempt %s", i+1)
             await asyncio.sleep(2)
         except Exception as e:
-            logger.error(f"❌ Attempt {i+1}: {e}")
+            logger.error("❌ Attempt %s: %s", i+1, e)
     
     # Step 2: Set empty commands
     try:
         await bot.set_my_commands([])
         logger.info("✅ Commands cleared")
     except Exception as e:
-        logger.error(f"❌ Clear commands: {e}")
+        logger.error("❌ Clear commands: %s", e)
     
     # Step 3: Close session
     await bot.session.close()